@@ -0,0 +1,59 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+LOWER_IS_BETTER = [
+    'seconds', 'frame_seconds', 'text_seconds', 'build_seconds', 'save_seconds', 'load_seconds',
+    'p50_ms', 'p99_ms', 'mean_ms', 'rss_mb', 'peak_rss_mb', 'index_mb', 'failures'
+]
+HIGHER_IS_BETTER = [
+    'units_per_sec', 'mb_per_sec', 'frame_rows_per_sec', 'text_mb_per_sec', 'chunks_per_sec',
+    'requests_per_sec', 'recall_at_k'
+]
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    return {f"{result['suite']}/{result['case']}": result for result in report['results']}
+
+def compare(base: Dict[str, Dict[str, Any]], head: Dict[str, Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    rows = []
+    for key in sorted(set(base) & set(head)):
+        base_metrics = base[key].get('metrics') or {}
+        head_metrics = head[key].get('metrics') or {}
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old, new = base_metrics.get(metric), head_metrics.get(metric)
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+                continue
+            
+            change = (new - old) / old if old else (0.0 if new == old else float('inf'))
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            rows.append({'case': key, 'metric': metric, 'base': old, 'head': new, 'change': change, 'regression': worse})
+    return rows
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files.')
+    parser.add_argument('base', help='results from the reference commit')
+    parser.add_argument('head', help='results from the commit under test')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative change counted as a regression')
+    args = parser.parse_args(argv)
+    
+    base, head = load_results(args.base), load_results(args.head)
+    rows = compare(base, head, args.threshold)
+    
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else ''
+        print(f"{row['case']:<28} {row['metric']:<20} {row['base']:>14.4g} {row['head']:>14.4g} {row['change']:>+9.1%} {flag}")
+    for key in sorted(set(base) ^ set(head)):
+        print(f'{key:<28} only in {"base" if key in base else "head"}')
+    for key in sorted(head):
+        if 'error' in head[key]:
+            print(f"{key:<28} failed: {head[key]['error']}")
+    
+    regressions = [row for row in rows if row['regression']]
+    print(f'{len(regressions)} regression(s) beyond {args.threshold:.0%}')
+    return 1 if regressions or any('error' in result for result in head.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Tuple
+
+VOCABULARY = [
+    'clinker', 'kiln', 'cement', 'limestone', 'gypsum', 'fly', 'ash', 'slag', 'raw', 'mill',
+    'preheater', 'cooler', 'burner', 'coal', 'petcoke', 'power', 'energy', 'heat', 'consumption',
+    'dispatch', 'bulk', 'bag', 'truck', 'rail', 'plant', 'grinding', 'packing', 'silo', 'quality',
+    'strength', 'fineness', 'blaine', 'residue', 'moisture', 'temperature', 'pressure', 'draft',
+    'shutdown', 'maintenance', 'breakdown', 'inventory', 'stock', 'sales', 'region', 'dealer',
+    'price', 'cost', 'margin', 'revenue', 'target', 'actual', 'variance', 'shift', 'operator',
+    'alarm', 'sensor', 'vibration', 'motor', 'fan', 'conveyor', 'crusher', 'quarry', 'blend',
+    'ratio', 'lsf', 'silica', 'alumina', 'iron', 'oxide', 'sulphur', 'chloride', 'emission',
+    'dust', 'filter', 'bag', 'house', 'stack', 'nox', 'sox', 'efficiency', 'uptime', 'output',
+    'tonnes', 'daily', 'monthly', 'quarterly', 'increase', 'decrease', 'growth', 'decline',
+] + [f'term{i:04d}' for i in range(2000)]
+
+class CorpusGenerator:
+    """Seeded generators for the synthetic files and chunk corpora used by the benchmarks."""
+    
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self.vocabulary = np.array(VOCABULARY)
+    
+    def tabular_frame(self, rows: int) -> pd.DataFrame:
+        rng = np.random.default_rng(self.seed)
+        df = pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=rows, freq='min').astype(str),
+            'plant': rng.choice(['Nimbahera', 'Mangrol', 'Muddapur', 'Panna', 'Balasinor'], rows),
+            'kiln_id': rng.integers(1, 5, rows),
+            'product': rng.choice(['OPC 43', 'OPC 53', 'PPC', 'PSC', 'White'], rows),
+            'kiln_temp_c': rng.normal(1450, 25, rows).round(1),
+            'draft_pressure_mbar': rng.normal(-5, 1.5, rows).round(2),
+            'output_tonnes': rng.gamma(9, 12, rows).round(2),
+            'energy_kwh': rng.normal(7800, 600, rows).round(1),
+            'status': rng.choice(['running', 'running', 'running', 'maintenance', 'stopped'], rows)
+        })
+        # Sprinkle missing values so clean_data has work to do
+        for col in ['kiln_temp_c', 'energy_kwh', 'product']:
+            df.loc[rng.random(rows) < 0.02, col] = None
+        return df
+    
+    def write_csv(self, path: str, rows: int) -> Dict[str, int]:
+        self.tabular_frame(rows).to_csv(path, index=False)
+        return {'rows': rows}
+    
+    def write_excel(self, path: str, rows: int, sheets: int = 2) -> Dict[str, int]:
+        df = self.tabular_frame(rows)
+        per_sheet = -(-rows // sheets)
+        with pd.ExcelWriter(path) as writer:
+            for i in range(sheets):
+                df.iloc[i * per_sheet:(i + 1) * per_sheet].to_excel(writer, sheet_name=f'Plant{i + 1}', index=False)
+        return {'rows': rows, 'sheets': sheets}
+    
+    def write_json(self, path: str, rows: int) -> Dict[str, int]:
+        # Records sit under a nested key, the shape ERP exports usually have
+        df = self.tabular_frame(rows)
+        records = json.loads(df.to_json(orient='records'))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'export': {'source': 'benchmark', 'rows': records}}, f)
+        return {'rows': rows}
+    
+    def write_pdf(self, path: str, pages: int, lines_per_page: int = 45) -> Dict[str, int]:
+        rng = np.random.default_rng(self.seed)
+        objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+        page_refs = []
+        for _ in range(pages):
+            lines = [' '.join(self.vocabulary[rng.integers(0, len(self.vocabulary), 12)]) for _ in range(lines_per_page)]
+            stream = 'BT /F1 10 Tf 40 800 Td 14 TL ' + ' '.join(f'({line}) Tj T*' for line in lines) + ' ET'
+            objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+            objects.append(
+                f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>'
+            )
+            page_refs.append(f'{len(objects)} 0 R')
+        objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {pages} >>"
+        
+        out = bytearray(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+        xref = len(out)
+        out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+        out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+        out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+        
+        with open(path, 'wb') as f:
+            f.write(out)
+        return {'pages': pages}
+    
+    def chunk_batches(self, documents: int, chunks_per_doc: int, batch_size: int = 10000) -> Iterator[Tuple[List[str], List[Dict], List[str]]]:
+        # Yields (texts, metadatas, ids) in the shape VectorDatabase.add_documents takes
+        rng = np.random.default_rng(self.seed)
+        texts, metadatas, ids = [], [], []
+        for doc in range(documents):
+            metadata = {'file_id': f'doc{doc}', 'filename': f'doc{doc}.csv', 'file_type': 'csv'}
+            words = self.vocabulary[rng.integers(0, len(self.vocabulary), (chunks_per_doc, 24))]
+            for chunk in range(chunks_per_doc):
+                texts.append(f'doc{doc} chunk{chunk} ' + ' '.join(words[chunk]))
+                metadatas.append(metadata)
+                ids.append(f'doc{doc}_{chunk}')
+                if len(texts) >= batch_size:
+                    yield texts, metadatas, ids
+                    texts, metadatas, ids = [], [], []
+        if texts:
+            yield texts, metadatas, ids
+    
+    def queries(self, count: int, documents: int) -> List[str]:
+        # Drawn from the same vocabulary as the chunks; recall is scored against an exact scan, not labels
+        rng = np.random.default_rng(self.seed + 1)
+        queries = []
+        for _ in range(count):
+            words = self.vocabulary[rng.integers(0, len(self.vocabulary), 6)]
+            queries.append(f'doc{rng.integers(documents)} ' + ' '.join(words))
+        return queries
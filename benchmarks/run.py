@@ -0,0 +1,362 @@
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from queue import Empty
+import numpy as np
+from typing import Any, Dict, List
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.stubs import install_stubs
+
+# (documents, chunks per document); totals run from 10k to 5M chunks
+GRIDS = {
+    'quick': [(100, 100), (200, 250)],
+    'default': [(100, 100), (1000, 100), (1000, 1000)],
+    'full': [(100, 100), (1000, 100), (1000, 1000), (10000, 500)]
+}
+
+def rss_mb() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        return None
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ms = np.array(samples) * 1000
+    return {
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'mean_ms': float(ms.mean())
+    }
+
+def reference_similarities(embeddings: List[np.ndarray], query: np.ndarray, block: int = 100000) -> np.ndarray:
+    # float64 blockwise cosine scan, independent of VectorDatabase.search, so it can disagree with the index
+    query = np.asarray(query, dtype=np.float64)
+    query = query / np.linalg.norm(query)
+    sims = np.empty(len(embeddings))
+    for start in range(0, len(embeddings), block):
+        matrix = np.asarray(embeddings[start:start + block], dtype=np.float64)
+        sims[start:start + len(matrix)] = matrix @ query / np.linalg.norm(matrix, axis=1)
+    return sims
+
+def recall_at_k(sims: np.ndarray, returned: List[int], k: int, tolerance: float = 1e-6) -> float:
+    # Any result scoring within tolerance of the true k-th best counts, so ties and float32 rounding are not misses
+    k = min(k, len(sims))
+    kth = np.partition(sims, -k)[-k]
+    return sum(1 for i in returned[:k] if sims[i] >= kth - tolerance) / k
+
+def bench_ingest(fmt: str, size: int, seed: int) -> Dict[str, Any]:
+    from src.pipelines.ingestion import DataIngestionPipeline
+    from src.utils.metrics import metrics
+    
+    generator = CorpusGenerator(seed)
+    writers = {
+        'csv': generator.write_csv,
+        'xlsx': generator.write_excel,
+        'json': generator.write_json,
+        'pdf': generator.write_pdf
+    }
+    path = os.path.join(os.environ['UPLOAD_FOLDER'], f'bench.{fmt}')
+    info = writers[fmt](path, size)
+    file_mb = os.path.getsize(path) / 2 ** 20
+    
+    pipeline = DataIngestionPipeline()
+    metrics.reset()
+    start = time.perf_counter()
+    result = pipeline.process_file(path)
+    seconds = time.perf_counter() - start
+    if result['status'] != 'success':
+        raise RuntimeError(result.get('error'))
+    
+    units = info.get('rows', info.get('pages'))
+    return {
+        'unit': 'rows' if 'rows' in info else 'pages',
+        'units': units,
+        'file_mb': file_mb,
+        'seconds': seconds,
+        'units_per_sec': units / seconds,
+        'mb_per_sec': file_mb / seconds,
+        'chunks': pipeline.rag_model.vector_db.get_collection_stats()['document_count'],
+        'rss_mb': rss_mb(),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+def bench_chunk(rows: int, seed: int) -> Dict[str, Any]:
+    from src.data.processors import DataProcessor
+    
+    processor = DataProcessor()
+    df = CorpusGenerator(seed).tabular_frame(rows)
+    
+    start = time.perf_counter()
+    frame_chunks = processor.chunk_data(df)
+    frame_seconds = time.perf_counter() - start
+    
+    text = '\n'.join(frame_chunks)
+    start = time.perf_counter()
+    text_chunks = processor.chunk_data(text)
+    text_seconds = time.perf_counter() - start
+    
+    return {
+        'rows': rows,
+        'frame_seconds': frame_seconds,
+        'frame_rows_per_sec': rows / frame_seconds,
+        'frame_chunks': len(frame_chunks),
+        'text_mb': len(text) / 2 ** 20,
+        'text_seconds': text_seconds,
+        'text_mb_per_sec': len(text) / 2 ** 20 / text_seconds if text_seconds else None,
+        'text_chunks': len(text_chunks),
+        'rss_mb': rss_mb(),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+def bench_search(documents: int, chunks_per_doc: int, queries: int, k: int, seed: int) -> Dict[str, Any]:
+    from src.utils.vectorizer import VectorDatabase
+    from src.utils.metrics import metrics
+    
+    generator = CorpusGenerator(seed)
+    persist_directory = os.path.join(os.getcwd(), 'vector_db')
+    db = VectorDatabase(persist_directory)
+    
+    start = time.perf_counter()
+    for texts, metadatas, ids in generator.chunk_batches(documents, chunks_per_doc):
+        db.add_documents(texts, metadatas, ids, persist=False)
+    build_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    db.save()
+    save_seconds = time.perf_counter() - start
+    total = len(db.documents)
+    
+    # Empty the store and reload it in place, so load_seconds covers reading the index and not building the encoder
+    db.documents, db.metadatas, db.ids, db.embeddings, db.file_metadata = [], [], [], [], {}
+    gc.collect()
+    start = time.perf_counter()
+    db._load_data()
+    load_seconds = time.perf_counter() - start
+    assert len(db.documents) == total
+    
+    # Generated chunk texts are unique, so they map search results back to index positions
+    positions = {text: i for i, text in enumerate(db.documents)}
+    latencies, recalls = [], []
+    metrics.reset()
+    for query in generator.queries(queries, documents):
+        start = time.perf_counter()
+        result = db.search(query, k)
+        latencies.append(time.perf_counter() - start)
+        
+        sims = reference_similarities(db.embeddings, db.encoder.encode([query])[0])
+        recalls.append(recall_at_k(sims, [positions[text] for text in result['documents']], k))
+    
+    return {
+        'chunks': total,
+        'build_seconds': build_seconds,
+        'chunks_per_sec': total / build_seconds,
+        'save_seconds': save_seconds,
+        'load_seconds': load_seconds,
+        'index_mb': os.path.getsize(os.path.join(persist_directory, 'data.pkl')) / 2 ** 20,
+        **percentiles(latencies),
+        'recall_at_k': float(np.mean(recalls)),
+        'k': k,
+        'rss_mb': rss_mb(),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+def bench_query(documents: int, chunks_per_doc: int, requests: int, seed: int) -> Dict[str, Any]:
+    from src.utils.vectorizer import VectorDatabase
+    from src.utils.metrics import metrics
+    
+    generator = CorpusGenerator(seed)
+    # RAGModel reads ./vector_db, so the corpus has to be on disk before the app is imported
+    db = VectorDatabase('./vector_db')
+    for texts, metadatas, ids in generator.chunk_batches(documents, chunks_per_doc):
+        db.add_documents(texts, metadatas, ids, persist=False)
+    db.save()
+    del db
+    gc.collect()
+    
+    from src.app import create_app
+    client = create_app().test_client()
+    
+    queries = generator.queries(requests + 1, documents)
+    client.post('/api/query', json={'query': queries[0]})
+    
+    latencies, failures = [], 0
+    metrics.reset()
+    for query in queries[1:]:
+        start = time.perf_counter()
+        response = client.post('/api/query', json={'query': query, 'analysis_type': 'trend'})
+        latencies.append(time.perf_counter() - start)
+        failures += response.status_code != 200
+    
+    return {
+        'chunks': documents * chunks_per_doc,
+        'requests': requests,
+        'failures': failures,
+        **percentiles(latencies),
+        'requests_per_sec': requests / sum(latencies),
+        'rss_mb': rss_mb(),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+BENCHMARKS = {
+    'ingest': bench_ingest,
+    'chunk': bench_chunk,
+    'search': bench_search,
+    'query': bench_query
+}
+
+def run_case(name: str, kwargs: Dict[str, Any], dim: int, llm_latency: float) -> Dict[str, Any]:
+    # Every case gets a fresh working directory so the ./vector_db and ./uploads defaults are isolated
+    with tempfile.TemporaryDirectory(prefix='rag-bench-') as workdir:
+        os.chdir(workdir)
+        os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+        os.environ['OUTPUT_FOLDER'] = os.path.join(workdir, 'outputs')
+        os.environ['VECTOR_DB_PATH'] = os.path.join(workdir, 'vector_db')
+        os.makedirs(os.environ['UPLOAD_FOLDER'], exist_ok=True)
+        
+        install_stubs(dim=dim, llm_latency=llm_latency)
+        from src.utils.metrics import metrics
+        metrics.reset()
+        try:
+            result = BENCHMARKS[name](**kwargs)
+            # Per-stage totals from the tracing layer show where a regression's time went; each case resets
+            # them after its setup, so they only cover the measured section
+            result['stages'] = metrics.stage_summary()
+            return result
+        finally:
+            os.chdir(project_root)
+
+def _child(queue, name: str, kwargs: Dict[str, Any], dim: int, llm_latency: float):
+    try:
+        queue.put({'metrics': run_case(name, kwargs, dim, llm_latency)})
+    except Exception as e:
+        queue.put({'error': f'{type(e).__name__}: {e}'})
+
+def run_isolated(name: str, kwargs: Dict[str, Any], dim: int, llm_latency: float) -> Dict[str, Any]:
+    # A spawned process per case keeps RSS numbers from leaking between cases
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(queue, name, kwargs, dim, llm_latency))
+    process.start()
+    while True:
+        try:
+            outcome = queue.get(timeout=1)
+            break
+        except Empty:
+            # A case killed by the OOM killer never reports back
+            if not process.is_alive():
+                outcome = {'error': f'benchmark process exited with code {process.exitcode}'}
+                break
+    process.join()
+    return outcome
+
+def build_cases(args) -> List[Dict[str, Any]]:
+    suites = ['ingest', 'chunk', 'search', 'query'] if args.suite == 'all' else [args.suite]
+    cases = []
+    if 'ingest' in suites:
+        for fmt in ['csv', 'xlsx', 'json']:
+            cases.append({'suite': 'ingest', 'case': f'{fmt}_{args.rows}', 'kwargs': {'fmt': fmt, 'size': args.rows}})
+        cases.append({'suite': 'ingest', 'case': f'pdf_{args.pages}', 'kwargs': {'fmt': 'pdf', 'size': args.pages}})
+    if 'chunk' in suites:
+        cases.append({'suite': 'chunk', 'case': f'rows_{args.rows}', 'kwargs': {'rows': args.rows}})
+    if 'search' in suites:
+        for documents, chunks_per_doc in GRIDS[args.grid]:
+            cases.append({
+                'suite': 'search',
+                'case': f'{documents}x{chunks_per_doc}',
+                'kwargs': {'documents': documents, 'chunks_per_doc': chunks_per_doc, 'queries': args.queries, 'k': args.k}
+            })
+    if 'query' in suites:
+        documents, chunks_per_doc = GRIDS[args.grid][0]
+        cases.append({
+            'suite': 'query',
+            'case': f'{documents}x{chunks_per_doc}',
+            'kwargs': {'documents': documents, 'chunks_per_doc': chunks_per_doc, 'requests': args.queries}
+        })
+    
+    for case in cases:
+        case['kwargs']['seed'] = args.seed
+    return cases
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=project_root, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--', 'src'], cwd=project_root, text=True).strip())
+        return {'commit': commit, 'dirty': dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline benchmarks for ingestion, retrieval and query paths.')
+    parser.add_argument('--suite', choices=['all'] + list(BENCHMARKS), default='all')
+    parser.add_argument('--grid', choices=list(GRIDS), default='quick', help='documents x chunks grid for search/query')
+    parser.add_argument('--rows', type=int, default=100000, help='rows in generated CSV/XLSX/JSON files')
+    parser.add_argument('--pages', type=int, default=200, help='pages in the generated PDF')
+    parser.add_argument('--queries', type=int, default=50, help='queries per search/query case')
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--dim', type=int, default=384, help='stub embedding dimension (all-MiniLM-L6-v2 is 384)')
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='simulated seconds per stub LLM call')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-isolate', action='store_true', help='run cases in this process (RSS is then cumulative)')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<commit>.json)')
+    args = parser.parse_args(argv)
+    
+    revision = git_revision()
+    results = []
+    for case in build_cases(args):
+        print(f"[{case['suite']}] {case['case']} ...", flush=True)
+        if args.no_isolate:
+            try:
+                outcome = {'metrics': run_case(case['suite'], case['kwargs'], args.dim, args.llm_latency)}
+            except Exception as e:
+                outcome = {'error': f'{type(e).__name__}: {e}'}
+        else:
+            outcome = run_isolated(case['suite'], case['kwargs'], args.dim, args.llm_latency)
+        
+        results.append({'suite': case['suite'], 'case': case['case'], 'params': case['kwargs'], **outcome})
+        print(f"    {json.dumps(outcome, default=str)}", flush=True)
+    
+    report = {
+        'meta': {
+            **revision,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'args': vars(args)
+        },
+        'results': results
+    }
+    
+    output = args.output or os.path.join(project_root, 'benchmarks', 'results', f"{(revision['commit'] or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f'Results written to {output}')
+    
+    return 1 if any('error' in result for result in results) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
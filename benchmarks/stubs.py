@@ -0,0 +1,54 @@
+import time
+import zlib
+import numpy as np
+from types import SimpleNamespace
+from typing import List
+
+class StubEncoder:
+    """Deterministic stand-in for SentenceTransformer: each text is the sum of hashed word vectors."""
+    
+    def __init__(self, dim: int = 384, buckets: int = 4096, seed: int = 0):
+        self.dim = dim
+        self.buckets = buckets
+        rng = np.random.default_rng(seed)
+        self.word_vectors = rng.standard_normal((buckets, dim)).astype(np.float32)
+    
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            ids = [zlib.crc32(word.encode('utf-8')) % self.buckets for word in text.lower().split()]
+            if ids:
+                embeddings[i] = self.word_vectors[ids].sum(axis=0)
+        
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms > 0, norms, 1)
+
+class StubOpenAI:
+    """Replaces the `openai` module in RAGModel with a fixed answer and an optional simulated delay."""
+    
+    def __init__(self, latency: float = 0.0):
+        self.api_key = None
+        self.latency = latency
+        self.calls = 0
+        self.ChatCompletion = self
+    
+    def create(self, model: str = None, messages: List[dict] = None, **kwargs) -> SimpleNamespace:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        
+        prompt = messages[-1]['content'] if messages else ''
+        content = (
+            f"Stub analysis over {len(prompt)} prompt characters. "
+            "Output shows an increase in kiln throughput; we recommend reviewing energy usage."
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def install_stubs(dim: int = 384, llm_latency: float = 0.0) -> StubOpenAI:
+    # Patch the names the app modules bound at import time, before any pipeline is constructed
+    import src.utils.vectorizer as vectorizer
+    import src.models.rag_model as rag_model
+    
+    vectorizer.SentenceTransformer = lambda *args, **kwargs: StubEncoder(dim=dim)
+    rag_model.openai = StubOpenAI(llm_latency)
+    return rag_model.openai
@@ -1,17 +1,72 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, g, request, jsonify
 import os
+import time
 from werkzeug.utils import secure_filename
 from src.pipelines.ingestion import DataIngestionPipeline
 from src.pipelines.analysis import AnalysisPipeline
+from src.pipelines.visualization import VisualizationPipeline
 from src.models.rag_model import RAGModel
 from src.config.config import Config
+from src.utils.metrics import metrics
+from src.utils.profiler import profiler
 
 api_bp = Blueprint('api', __name__)
 config = Config()
 ingestion = DataIngestionPipeline()
 analysis = AnalysisPipeline()
+visualization = VisualizationPipeline()
 rag_model = RAGModel()
 
+def embedding_bytes() -> int:
+    # Every embedding comes from the same encoder, so one vector's size is enough
+    embeddings = ingestion.rag_model.vector_db.embeddings
+    return len(embeddings) * embeddings[0].nbytes if embeddings else 0
+
+metrics.describe('rag_http_request_duration_seconds', 'histogram', 'API request latency by endpoint')
+metrics.describe('rag_http_requests_total', 'counter', 'API requests by endpoint and status code')
+metrics.describe('rag_http_requests_in_flight', 'gauge', 'API requests currently being handled')
+metrics.register_gauge('rag_vector_db_documents', lambda: len(ingestion.rag_model.vector_db.documents), 'Chunks held in the vector store')
+metrics.register_gauge('rag_vector_db_embedding_bytes', embedding_bytes, 'Memory used by stored embeddings')
+metrics.register_gauge('rag_chart_cache_entries', visualization.cache_size, 'Rendered charts held in the chart cache')
+metrics.register_gauge('rag_profiler_running', lambda: profiler.running, 'Whether the sampling profiler is active')
+
+if config.PROFILER_ENABLED:
+    profiler.start(config.PROFILER_INTERVAL)
+
+def _timings_requested() -> bool:
+    return request.args.get('timings', '').lower() in ['1', 'true'] or request.headers.get('X-Request-Timing') == '1'
+
+@api_bp.before_request
+def start_request_trace():
+    g.trace_token = metrics.start_trace()
+    g.request_started = time.perf_counter()
+    metrics.add_gauge('rag_http_requests_in_flight', 1)
+
+@api_bp.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unknown'
+    metrics.observe('rag_http_request_duration_seconds', time.perf_counter() - g.request_started, endpoint=endpoint)
+    metrics.increment('rag_http_requests_total', endpoint=endpoint, status=response.status_code)
+    
+    trace = metrics.current_trace()
+    if trace is not None and _timings_requested():
+        breakdown = trace.breakdown()
+        response.headers['Server-Timing'] = ', '.join(
+            f"{stage};dur={timing['ms']}" for stage, timing in breakdown['stages'].items()
+        )
+        body = response.get_json(silent=True) if response.is_json else None
+        if isinstance(body, dict):
+            body['timings'] = breakdown
+            response.set_data(current_app.json.dumps(body))
+    return response
+
+@api_bp.teardown_request
+def end_request_trace(exc):
+    metrics.add_gauge('rag_http_requests_in_flight', -1)
+    token = g.pop('trace_token', None)
+    if token is not None:
+        metrics.end_trace(token)
+
 @api_bp.route('/upload', methods=['POST'])
 def upload_file():
     if 'file' not in request.files:
@@ -46,6 +101,62 @@ def get_insights(file_id):
     insights = rag_model.generate_insights(file_id)
     return jsonify(insights)
 
+@api_bp.route('/chart/<file_id>', methods=['POST'])
+def get_chart(file_id):
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    chart_type = data.pop('chart_type', 'auto')
+    sheet = data.pop('sheet', None)
+    if sheet is not None and not isinstance(sheet, str):
+        return jsonify({'error': 'sheet must be a string'}), 400
+    
+    # The ingestion pipeline's store sees files uploaded since startup
+    metadata = ingestion.rag_model.vector_db.get_file_metadata(file_id)
+    if not metadata:
+        return jsonify({'error': 'File not found'}), 404
+    
+    file_path = metadata.get('file_path') or os.path.join(config.UPLOAD_FOLDER, metadata['filename'])
+    if not os.path.exists(file_path):
+        return jsonify({'error': 'Source file is no longer available'}), 404
+    
+    result = visualization.get_chart(file_id, file_path, chart_type, sheet, data)
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+@api_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api_bp.route('/profiler', methods=['GET', 'POST'])
+def control_profiler():
+    if request.method == 'POST':
+        # Sampling every thread's stack is costly and exposes code paths, so runtime control is opt-in
+        if not config.PROFILER_ALLOW_RUNTIME:
+            return jsonify({'error': 'Runtime profiling is disabled; set PROFILER_ALLOW_RUNTIME to enable it'}), 403
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        action = data.get('action')
+        if action == 'start':
+            interval = data.get('interval', config.PROFILER_INTERVAL)
+            if isinstance(interval, bool) or not isinstance(interval, (int, float)) or not 0 < interval < float('inf'):
+                return jsonify({'error': 'interval must be a positive number of seconds'}), 400
+            changed = profiler.start(float(interval), data.get('reset', True))
+        elif action == 'stop':
+            changed = profiler.stop()
+        else:
+            return jsonify({'error': "action must be 'start' or 'stop'"}), 400
+        return jsonify({'changed': changed, **profiler.snapshot(limit=0)})
+    
+    if request.args.get('format') == 'folded':
+        return Response(profiler.folded(), content_type='text/plain; charset=utf-8')
+    limit = request.args.get('limit', '50')
+    if not limit.isdecimal():
+        return jsonify({'error': 'limit must be a non-negative integer'}), 400
+    return jsonify(profiler.snapshot(int(limit)))
+
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
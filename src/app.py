@@ -1,4 +1,5 @@
 from flask import Flask, render_template
+from plotly.offline import get_plotlyjs_version
 from flask_cors import CORS
 import os
 from src.config.config import Config
@@ -20,7 +21,8 @@ def create_app():
     
     @app.route('/')
     def index():
-        return render_template('index.html')
+        # Chart specs are written by the Python plotly package, so the page loads the plotly.js it was built against
+        return render_template('index.html', plotlyjs_version=get_plotlyjs_version())
     
     return app
 
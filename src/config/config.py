@@ -10,6 +10,13 @@ class Config:
     OUTPUT_FOLDER = os.getenv('OUTPUT_FOLDER', './outputs')
     VECTOR_DB_PATH = os.getenv('VECTOR_DB_PATH', './vector_db')
     MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', '104857600'))
+    INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '5000'))
+    CHART_MAX_POINTS = int(os.getenv('CHART_MAX_POINTS', '2000'))
+    CHART_MAX_BARS = int(os.getenv('CHART_MAX_BARS', '50'))
+    CHART_CACHE_SIZE = int(os.getenv('CHART_CACHE_SIZE', '128'))
+    PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'False').lower() in ['1', 'true', 'yes']
+    PROFILER_INTERVAL = float(os.getenv('PROFILER_INTERVAL', '0.01'))
+    PROFILER_ALLOW_RUNTIME = os.getenv('PROFILER_ALLOW_RUNTIME', 'False').lower() in ['1', 'true', 'yes']
     
     SUPPORTED_FORMATS = [
         'csv', 'xlsx', 'xls', 'json', 'pdf', 'docx', 
@@ -1,9 +1,12 @@
 import pandas as pd
+import itertools
 import json
+import ijson
 import PyPDF2
 from docx import Document
 import xml.etree.ElementTree as ET
-from typing import Any, Dict
+from xml.parsers import expat
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from src.utils.db_connector import DatabaseConnector
 
 class DataLoader:
@@ -37,16 +40,274 @@ class DataLoader:
         root = tree.getroot()
         return self._xml_to_dict(root)
     
+    def iter_json_records(self, file_path: str, batch_size: int = 5000) -> Iterator[pd.DataFrame]:
+        prefix, columns = self._detect_json_record_prefix(file_path)
+        with open(file_path, 'rb') as f:
+            if prefix is None:
+                yield self._records_to_frame(list(ijson.items(f, '', use_float=True)))
+                return
+            records = (self._json_row_to_record(row, columns) for row in ijson.items(f, prefix, use_float=True))
+            yield from self._batch_records(records, batch_size)
+    
+    def iter_xml_records(self, file_path: str, batch_size: int = 5000) -> Iterator[pd.DataFrame]:
+        record_path = self._detect_xml_record_path(file_path)
+        if record_path is None:
+            # Nothing repeats, so the whole document is a single record
+            record = self.load_xml(file_path)
+            if not record:
+                raise ValueError("XML file contains no records")
+            yield self._records_to_frame([record])
+            return
+        
+        yield from self._batch_records(self._iter_xml_elements(file_path, record_path), batch_size)
+    
+    def load_table(self, file_path: str, sheet_name: str = None) -> pd.DataFrame:
+        ext = file_path.split('.')[-1].lower()
+        if ext == 'csv':
+            return self.load_csv(file_path)
+        elif ext in ['xlsx', 'xls']:
+            return pd.read_excel(file_path, sheet_name=sheet_name or 0)
+        elif ext == 'json':
+            return pd.concat(self.iter_json_records(file_path), ignore_index=True)
+        elif ext == 'xml':
+            return pd.concat(self.iter_xml_records(file_path), ignore_index=True)
+        elif ext in ['db', 'sqlite', 'sqlite3', 'accdb', 'mdb']:
+            if not sheet_name:
+                # Like Excel's first sheet; load_database without a table only lists the table names
+                tables = self.db_connector.query_database(file_path)
+                if tables.empty:
+                    raise ValueError("Database contains no tables")
+                sheet_name = str(tables.iloc[0, 0])
+            return self.load_database(file_path, sheet_name)
+        raise ValueError(f"No tabular data for file format: {ext}")
+    
     def load_database(self, file_path: str, table_name: str = None) -> pd.DataFrame:
         if table_name:
-            return self.db_connector.query_database(file_path, f"SELECT * FROM {table_name}")
+            # Table names can come from API requests, so only accept tables that exist and quote them
+            tables = self.db_connector.query_database(file_path).iloc[:, 0].astype(str).tolist()
+            if table_name not in tables:
+                raise ValueError(f"Unknown table: {table_name}")
+            if file_path.split('.')[-1].lower() in ['accdb', 'mdb']:
+                quoted = '[' + table_name.replace(']', ']]') + ']'
+            else:
+                quoted = '"' + table_name.replace('"', '""') + '"'
+            return self.db_connector.query_database(file_path, f"SELECT * FROM {quoted}")
         return self.db_connector.query_database(file_path)
     
     def _xml_to_dict(self, element) -> Dict[str, Any]:
-        result = {}
+        result = {f'@{key}': value for key, value in element.attrib.items()}
         for child in element:
-            if len(child) == 0:
-                result[child.tag] = child.text
+            if len(child) == 0 and not child.attrib:
+                value = child.text
+            else:
+                value = self._xml_to_dict(child)
+            
+            # Repeated sibling tags are collected into a list instead of overwriting each other
+            if child.tag not in result:
+                result[child.tag] = value
+            elif isinstance(result[child.tag], list):
+                result[child.tag].append(value)
             else:
-                result[child.tag] = self._xml_to_dict(child)
-        return result
\ No newline at end of file
+                result[child.tag] = [result[child.tag], value]
+        
+        if not len(element) and element.text and element.text.strip():
+            result['#text'] = element.text
+        return result
+    
+    def _detect_json_record_prefix(self, file_path: str, sample_size: int = 100000) -> Tuple[Optional[str], Optional[List[str]]]:
+        # Profile every array seen in a bounded prefix of the file: how many items it holds, whether they are
+        # containers, and whether its items carry scalar fields of their own or only wrap further arrays
+        items: Dict[str, int] = {}
+        containers, fields = set(), set()
+        column_names: Dict[str, List[Any]] = {}
+        root_fields, top_level, scanned_all = False, None, True
+        with open(file_path, 'rb') as f:
+            for seen, (prefix, event, value) in enumerate(ijson.parse(f)):
+                if seen >= sample_size:
+                    scanned_all = False
+                    break
+                if top_level is None:
+                    top_level = event
+                if event in ['end_map', 'end_array', 'map_key']:
+                    continue
+                
+                is_item = prefix == 'item' or prefix.endswith('.item')
+                if is_item:
+                    items[prefix] = items.get(prefix, 0) + 1
+                if event in ['start_map', 'start_array']:
+                    if is_item:
+                        containers.add(prefix)
+                    continue
+                
+                if is_item:
+                    # Scalars inside an array that is itself an item are the cells of a row array
+                    array = prefix[:-len('item')].rstrip('.')
+                    owner = array if array == 'item' or array.endswith('.item') else False
+                    if prefix == 'columns.item' or prefix.endswith('.columns.item'):
+                        column_names.setdefault(prefix[:-len('columns.item')], []).append(value)
+                else:
+                    owner = self._json_enclosing_item(prefix)
+                if owner is None:
+                    root_fields = True
+                elif owner:
+                    fields.add(owner)
+        
+        def is_nested(child: str, parent: str) -> bool:
+            return child.startswith(parent + '.')
+        
+        # Scalar arrays only hold records when their parent has no fields of its own; otherwise they are a list
+        # inside that parent's record (e.g. the tags of a single object)
+        eligible = {}
+        for prefix, count in items.items():
+            if prefix in containers:
+                eligible[prefix] = count
+                continue
+            array = prefix[:-len('item')].rstrip('.')
+            if array == 'item' or array.endswith('.item'):
+                continue
+            owner = self._json_enclosing_item(array)
+            if not (root_fields if owner is None else owner in fields):
+                eligible[prefix] = count
+        
+        # Wrapper arrays (items without fields, or a single item) are stepped through to the arrays they hold;
+        # any other array is a record set and the arrays nested in it stay inside its records
+        def is_wrapper(prefix: str) -> bool:
+            return (prefix not in fields or items[prefix] == 1) and any(is_nested(other, prefix) for other in eligible)
+        
+        outer = {
+            prefix: count for prefix, count in eligible.items()
+            if not is_wrapper(prefix) and all(is_wrapper(parent) for parent in eligible if is_nested(prefix, parent))
+        }
+        structured = {prefix: count for prefix, count in outer.items() if prefix in containers}
+        prefix = self._pick_record_path(structured or outer)
+        
+        if prefix is None:
+            if top_level == 'start_array':
+                raise ValueError("JSON file contains no records")
+            if not scanned_all:
+                raise ValueError("No repeated records found in the JSON sample")
+            return None, None
+        
+        # pandas orient='split' keeps the column names in an array next to the rows
+        array = prefix[:-len('item')].rstrip('.')
+        columns = column_names.get(array[:len(array) - len(array.split('.')[-1])]) if array else None
+        return prefix, columns
+    
+    def _json_enclosing_item(self, prefix: str) -> Optional[str]:
+        parts = prefix.split('.')
+        if 'item' not in parts:
+            return None
+        last = len(parts) - 1 - parts[::-1].index('item')
+        return '.'.join(parts[:last + 1])
+    
+    def _json_row_to_record(self, row: Any, columns: Optional[List[Any]]) -> Any:
+        if not isinstance(row, list):
+            return row
+        if columns and len(columns) == len(row):
+            return {str(name): value for name, value in zip(columns, row)}
+        return {str(i): value for i, value in enumerate(row)}
+    
+    def _detect_xml_record_path(self, file_path: str) -> Optional[Tuple[str, ...]]:
+        # A structural pass over the whole file with bare expat callbacks, so a long header or lookup section
+        # ahead of the records cannot decide the record path. Paths are interned as ints and every open element
+        # gets a serial, so a path repeats when it is seen twice under the same parent serial
+        ids: Dict[Tuple[int, str], int] = {}
+        paths: List[Tuple[str, ...]] = [()]
+        counts, last_parent = [0], [-1]
+        repeated, with_attributes = set(), set()
+        serials = itertools.count(1)
+        stack = [(0, 0)]
+        
+        def start(tag, attributes):
+            parent, parent_serial = stack[-1]
+            key = ids.get((parent, tag))
+            if key is None:
+                key = ids[(parent, tag)] = len(paths)
+                # Match ElementTree's '{namespace}tag' names so paths line up with iterparse
+                paths.append(paths[parent] + ('{' + tag if '}' in tag else tag,))
+                counts.append(0)
+                last_parent.append(-1)
+            counts[key] += 1
+            if last_parent[key] == parent_serial:
+                repeated.add(key)
+            last_parent[key] = parent_serial
+            stack.append((key, next(serials)))
+            if attributes:
+                with_attributes.add(key)
+        
+        def end(tag):
+            stack.pop()
+        
+        parser = expat.ParserCreate(namespace_separator='}')
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        with open(file_path, 'rb') as f:
+            parser.ParseFile(f)
+        
+        parent_of = {key: parent for (parent, _), key in ids.items()}
+        children: Dict[int, set] = {}
+        for key, parent in parent_of.items():
+            children.setdefault(parent, set()).add(key)
+        
+        # Repeated bare values next to other fields (<tag>a</tag><tag>b</tag><qty>1</qty>) are a list in their parent
+        candidates = {
+            paths[key]: counts[key] for key in repeated
+            if key in children or key in with_attributes or children[parent_of[key]] == {key}
+        }
+        # Records are the leaf-most repeated elements; anything repeated above them only wraps them
+        leaf_most = {
+            key: count for key, count in candidates.items()
+            if not any(other != key and other[:len(key)] == key for other in candidates)
+        }
+        return self._pick_record_path(leaf_most)
+    
+    def _pick_record_path(self, counts: Dict[Any, int]) -> Optional[Any]:
+        # The path with the most items holds the records; when another comes close, guessing would drop data
+        if not counts:
+            return None
+        ranked = sorted(counts, key=counts.get, reverse=True)
+        if len(ranked) > 1 and counts[ranked[1]] * 2 > counts[ranked[0]]:
+            names = [path if isinstance(path, str) else '/'.join(path) for path in ranked[:2]]
+            raise ValueError(
+                f"Ambiguous records: {names[0]} ({counts[ranked[0]]} items) and {names[1]} ({counts[ranked[1]]} items)"
+            )
+        return ranked[0]
+    
+    def _iter_xml_elements(self, file_path: str, record_path: Tuple[str, ...]) -> Iterator[Dict[str, Any]]:
+        path, stack = [], []
+        for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                path.append(elem.tag)
+                stack.append(elem)
+                continue
+            
+            in_record = len(path) > len(record_path) and tuple(path[:len(record_path)]) == record_path
+            is_record = tuple(path) == record_path
+            path.pop()
+            stack.pop()
+            if in_record:
+                continue
+            if is_record:
+                yield self._xml_to_dict(elem) if len(elem) or elem.attrib else {elem.tag: elem.text}
+            # Detach every finished element outside a record, so neither records nor headers stay in the tree
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+    
+    def _batch_records(self, records: Iterator[Dict[str, Any]], batch_size: int) -> Iterator[pd.DataFrame]:
+        batch: List[Dict[str, Any]] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield self._records_to_frame(batch)
+                batch = []
+        if batch:
+            yield self._records_to_frame(batch)
+    
+    def _records_to_frame(self, records: List[Any]) -> pd.DataFrame:
+        records = [record if isinstance(record, dict) else {'value': record} for record in records]
+        df = pd.json_normalize(records)
+        # Nested lists stay in a single cell as JSON text so the frame remains hashable for cleaning
+        for col in df.select_dtypes(include=['object']).columns:
+            df[col] = df[col].map(lambda v: json.dumps(v, default=str) if isinstance(v, list) else v)
+        return df
\ No newline at end of file
@@ -1,8 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 import openai
 from src.utils.vectorizer import VectorDatabase
 from src.data.processors import DataProcessor
 from src.config.config import Config
+from src.utils.metrics import metrics
 
 class RAGModel:
     def __init__(self, vector_db_path: str = "./vector_db"):
@@ -12,7 +13,8 @@ class RAGModel:
         openai.api_key = self.config.OPENAI_API_KEY
         
     def ingest_data(self, data: Any, metadata: Dict[str, Any]) -> str:
-        chunks = self.data_processor.chunk_data(data)
+        with metrics.timer('ingest.chunk'):
+            chunks = self.data_processor.chunk_data(data)
         doc_id = metadata.get('file_id', 'unknown')
         ids = [f"{doc_id}_{i}" for i in range(len(chunks))]
         metadatas = [metadata for _ in chunks]
@@ -20,23 +22,44 @@ class RAGModel:
         self.vector_db.add_documents(chunks, metadatas, ids)
         return doc_id
     
-    def query(self, question: str, n_results: int = 5) -> Dict[str, Any]:
-        search_results = self.vector_db.search(question, n_results)
-        context = "\n".join(search_results.get('documents', []))
+    def ingest_stream(self, batches: Iterable[Any], metadata: Dict[str, Any]) -> int:
+        # Chunk and embed batch by batch, writing the index to disk once at the end
+        doc_id = metadata.get('file_id', 'unknown')
+        chunk_count = 0
+        checkpoint = self.vector_db.checkpoint()
+        try:
+            for batch in batches:
+                with metrics.timer('ingest.chunk'):
+                    chunks = self.data_processor.chunk_data(batch)
+                ids = [f"{doc_id}_{chunk_count + i}" for i in range(len(chunks))]
+                metadatas = [metadata for _ in chunks]
+                
+                self.vector_db.add_documents(chunks, metadatas, ids, persist=False)
+                chunk_count += len(chunks)
+        except Exception:
+            # A file that fails part-way must not leave its earlier batches behind for the next save()
+            self.vector_db.rollback(checkpoint)
+            raise
         
-        prompt = f"""
-        Data Context: {context}
-        User Query: {question}
+        self.vector_db.save()
+        return chunk_count
+    
+    def query(self, question: str, n_results: int = 5) -> Dict[str, Any]:
+        with metrics.timer('rag.retrieve'):
+            search_results = self.vector_db.search(question, n_results)
         
-        Provide detailed data analysis, insights, and actionable business recommendations.
-        """
+        with metrics.timer('rag.prompt'):
+            context = "\n".join(search_results.get('documents', []))
+            prompt = self._build_prompt(context, question)
         
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=1000,
-            temperature=0.3
-        )
+        with metrics.timer('rag.llm'):
+            response = openai.ChatCompletion.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=1000,
+                temperature=0.3
+            )
+        metrics.increment('rag_llm_calls_total')
         
         return {
             'answer': response.choices[0].message.content,
@@ -45,6 +68,14 @@ class RAGModel:
             'confidence': self._calculate_confidence(search_results)
         }
     
+    def _build_prompt(self, context: str, question: str) -> str:
+        return f"""
+        Data Context: {context}
+        User Query: {question}
+        
+        Provide detailed data analysis, insights, and actionable business recommendations.
+        """
+    
     def generate_insights(self, file_id: str) -> Dict[str, Any]:
         results = self.vector_db.search(f"file_id:{file_id}", n_results=50)
         context = "\n".join(results.get('documents', []))
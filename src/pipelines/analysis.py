@@ -1,13 +1,21 @@
 from typing import Dict, Any, List
 from src.models.rag_model import RAGModel
+from src.utils.metrics import metrics
 
 class AnalysisPipeline:
     def __init__(self):
         self.rag_model = RAGModel()
         
     def perform_analysis(self, query: str, analysis_type: str = 'general') -> Dict[str, Any]:
-        rag_response = self.rag_model.query(query)
+        known_type = analysis_type if analysis_type in ['statistical', 'trend', 'comparative'] else 'general'
+        metrics.increment('rag_analysis_requests_total', analysis_type=known_type)
+        with metrics.timer('analysis.rag'):
+            rag_response = self.rag_model.query(query)
         
+        with metrics.timer('analysis.postprocess'):
+            return self._dispatch_analysis(query, analysis_type, rag_response)
+    
+    def _dispatch_analysis(self, query: str, analysis_type: str, rag_response: Dict[str, Any]) -> Dict[str, Any]:
         if analysis_type == 'statistical':
             return self._statistical_analysis(query, rag_response)
         elif analysis_type == 'trend':
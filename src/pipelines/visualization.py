@@ -1,13 +1,73 @@
+import json
+import threading
+from collections import OrderedDict
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from src.data.loaders import DataLoader
+from src.utils.downsampling import Downsampler
+from src.config.config import Config
+from src.utils.metrics import metrics
 
 class VisualizationPipeline:
     def __init__(self):
         self.chart_types = ['bar', 'line', 'scatter', 'histogram', 'heatmap']
+        self.chart_options = {
+            'bar': ['x_col', 'y_col'],
+            'line': ['x_col', 'y_col'],
+            'scatter': ['x_col', 'y_col', 'mode'],
+            'histogram': ['col', 'bins'],
+            'heatmap': []
+        }
+        self.config = Config()
+        self.loader = DataLoader()
+        self.downsampler = Downsampler(self.config.CHART_MAX_POINTS)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def get_chart(self, file_id: str, file_path: str, chart_type: str, sheet: str = None, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        options = options or {}
+        key = (file_id, json.dumps({'chart_type': chart_type, 'sheet': sheet, 'options': options}, sort_keys=True, default=str))
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                metrics.increment('rag_chart_cache_requests_total', result='hit')
+                return self._cache[key]
+        metrics.increment('rag_chart_cache_requests_total', result='miss')
+        
+        try:
+            with metrics.timer('chart.load'):
+                data = self.loader.load_table(file_path, sheet)
+        except ValueError as e:
+            return {'error': str(e), 'chart_spec': None}
+        with metrics.timer('chart.render'):
+            chart = self.generate_visualization(data, chart_type, **options)
+        
+        if 'error' not in chart:
+            with self._cache_lock:
+                self._cache[key] = chart
+                if len(self._cache) > self.config.CHART_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return chart
+    
+    def cache_size(self) -> int:
+        return len(self._cache)
     
     def generate_visualization(self, data: pd.DataFrame, chart_type: str, **kwargs) -> Dict[str, Any]:
         try:
+            if chart_type not in self.chart_types:
+                if chart_type != 'auto':
+                    return {'error': f'Unsupported chart type: {chart_type}', 'chart_spec': None}
+                chart_type, kwargs = self._choose_auto_chart(data, kwargs)
+                if chart_type is None:
+                    return {'error': 'Unable to determine appropriate chart type', 'chart_spec': None}
+            
+            error = self._validate_options(data, chart_type, kwargs)
+            if error:
+                return {'error': error, 'chart_spec': None}
+            
             if chart_type == 'bar':
                 return self._create_bar_chart(data, **kwargs)
             elif chart_type == 'line':
@@ -16,12 +76,10 @@ class VisualizationPipeline:
                 return self._create_scatter_plot(data, **kwargs)
             elif chart_type == 'histogram':
                 return self._create_histogram(data, **kwargs)
-            elif chart_type == 'heatmap':
-                return self._create_heatmap(data, **kwargs)
             else:
-                return self._create_auto_chart(data)
+                return self._create_heatmap(data, **kwargs)
         except Exception as e:
-            return {'error': str(e), 'chart_html': None}
+            return {'error': str(e), 'chart_spec': None}
     
     def _create_bar_chart(self, data: pd.DataFrame, x_col: str = None, y_col: str = None) -> Dict[str, Any]:
         if not x_col:
@@ -29,11 +87,21 @@ class VisualizationPipeline:
         if not y_col:
             y_col = data.columns[1] if len(data.columns) > 1 else data.columns[0]
         
-        fig = px.bar(data, x=x_col, y=y_col, title=f'{y_col} by {x_col}')
+        # One bar per category instead of one rectangle per row
+        if pd.api.types.is_numeric_dtype(data[y_col]) and y_col != x_col:
+            grouped = data.groupby(x_col, sort=False)[y_col].sum()
+        else:
+            grouped = data.groupby(x_col, sort=False)[y_col].count()
+        if len(grouped) > self.config.CHART_MAX_BARS:
+            grouped = grouped.nlargest(self.config.CHART_MAX_BARS)
+        
+        fig = px.bar(x=grouped.index, y=grouped.values, labels={'x': x_col, 'y': y_col}, title=f'{y_col} by {x_col}')
         return {
-            'chart_html': fig.to_html(),
+            'chart_spec': self._to_spec(fig),
             'chart_type': 'bar',
-            'description': f'Bar chart showing {y_col} across different {x_col} values'
+            'description': f'Bar chart showing {y_col} across different {x_col} values',
+            'points': len(data),
+            'rendered_points': len(grouped)
         }
     
     def _create_line_chart(self, data: pd.DataFrame, x_col: str = None, y_col: str = None) -> Dict[str, Any]:
@@ -42,37 +110,76 @@ class VisualizationPipeline:
         if not y_col:
             y_col = data.columns[1] if len(data.columns) > 1 else data.columns[0]
         
-        fig = px.line(data, x=x_col, y=y_col, title=f'{y_col} Trend over {x_col}')
+        series = data[[x_col, y_col]].dropna() if x_col != y_col else data[[x_col]].dropna()
+        if len(series) > self.config.CHART_MAX_POINTS:
+            ordered = pd.api.types.is_numeric_dtype(series[x_col]) or pd.api.types.is_datetime64_any_dtype(series[x_col])
+            if ordered:
+                series = series.sort_values(x_col)
+            x = self.downsampler.to_numeric(series[x_col]) if ordered else np.arange(len(series), dtype=float)
+            y = self.downsampler.to_numeric(series[y_col])
+            if np.isnan(y).any():
+                indices = np.linspace(0, len(series) - 1, self.config.CHART_MAX_POINTS).astype(int)
+            else:
+                indices = self.downsampler.lttb(x, y)
+            series = series.iloc[indices]
+        
+        fig = px.line(series, x=x_col, y=y_col, title=f'{y_col} Trend over {x_col}')
         return {
-            'chart_html': fig.to_html(),
+            'chart_spec': self._to_spec(fig),
             'chart_type': 'line',
-            'description': f'Line chart showing trend of {y_col} over {x_col}'
+            'description': f'Line chart showing trend of {y_col} over {x_col}',
+            'points': len(data),
+            'rendered_points': len(series)
         }
     
-    def _create_scatter_plot(self, data: pd.DataFrame, x_col: str = None, y_col: str = None) -> Dict[str, Any]:
+    def _create_scatter_plot(self, data: pd.DataFrame, x_col: str = None, y_col: str = None, mode: str = 'hexbin') -> Dict[str, Any]:
         numeric_cols = data.select_dtypes(include=['number']).columns
         if len(numeric_cols) < 2:
             return {'error': 'Need at least 2 numeric columns for scatter plot'}
         
-        x_col = x_col or numeric_cols[0]
-        y_col = y_col or numeric_cols[1]
+        x_col = x_col or next(col for col in numeric_cols if col != y_col)
+        y_col = y_col or next(col for col in numeric_cols if col != x_col)
+        points = data[[x_col, y_col]].dropna()
+        
+        if len(points) <= self.config.CHART_MAX_POINTS:
+            fig = px.scatter(points, x=x_col, y=y_col, title=f'{y_col} vs {x_col}')
+            rendered = len(points)
+        elif mode == 'bin':
+            binned = self.downsampler.bin_2d(points[x_col].to_numpy(dtype=float), points[y_col].to_numpy(dtype=float))
+            fig = go.Figure(go.Heatmap(x=binned['x'], y=binned['y'], z=binned['z'], colorscale='Viridis', colorbar={'title': 'count'}))
+            rendered = int(np.count_nonzero(~np.isnan(binned['z'])))
+        else:
+            hexes = self.downsampler.hexbin(points[x_col].to_numpy(dtype=float), points[y_col].to_numpy(dtype=float))
+            fig = go.Figure(go.Scattergl(
+                x=hexes['x'], y=hexes['y'], mode='markers',
+                marker={'symbol': 'hexagon', 'size': 10, 'color': hexes['count'], 'colorscale': 'Viridis', 'showscale': True},
+                text=hexes['count'], hovertemplate='count: %{text}<extra></extra>'
+            ))
+            rendered = len(hexes['count'])
         
-        fig = px.scatter(data, x=x_col, y=y_col, title=f'{y_col} vs {x_col}')
+        fig.update_layout(title=f'{y_col} vs {x_col}', xaxis_title=x_col, yaxis_title=y_col)
         return {
-            'chart_html': fig.to_html(),
-            'chart_type': 'scatter'
+            'chart_spec': self._to_spec(fig),
+            'chart_type': 'scatter',
+            'points': len(points),
+            'rendered_points': rendered
         }
     
-    def _create_histogram(self, data: pd.DataFrame, col: str = None) -> Dict[str, Any]:
+    def _create_histogram(self, data: pd.DataFrame, col: str = None, bins: int = 50) -> Dict[str, Any]:
         numeric_cols = data.select_dtypes(include=['number']).columns
         if numeric_cols.empty:
             return {'error': 'No numeric columns found for histogram'}
         
         col = col or numeric_cols[0]
-        fig = px.histogram(data, x=col, title=f'Distribution of {col}')
+        # Bin on the server so only the counts are shipped to the browser
+        counts, edges = self.downsampler.histogram_bins(data[col].dropna().to_numpy(dtype=float), bins)
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+        fig.update_layout(title=f'Distribution of {col}', xaxis_title=col, yaxis_title='count', bargap=0)
         return {
-            'chart_html': fig.to_html(),
-            'chart_type': 'histogram'
+            'chart_spec': self._to_spec(fig),
+            'chart_type': 'histogram',
+            'points': int(counts.sum()),
+            'rendered_points': len(counts)
         }
     
     def _create_heatmap(self, data: pd.DataFrame) -> Dict[str, Any]:
@@ -83,19 +190,40 @@ class VisualizationPipeline:
         corr_matrix = numeric_data.corr()
         fig = px.imshow(corr_matrix, text_auto=True, title='Correlation Heatmap')
         return {
-            'chart_html': fig.to_html(),
+            'chart_spec': self._to_spec(fig),
             'chart_type': 'heatmap'
         }
     
-    def _create_auto_chart(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _choose_auto_chart(self, data: pd.DataFrame, options: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+        # Caller options are kept and only the defaults the old auto chart used are filled in
         numeric_cols = data.select_dtypes(include=['number']).columns
         categorical_cols = data.select_dtypes(include=['object']).columns
         
         if len(numeric_cols) >= 2:
-            return self._create_scatter_plot(data)
+            return 'scatter', options
         elif len(numeric_cols) == 1 and len(categorical_cols) >= 1:
-            return self._create_bar_chart(data, categorical_cols[0], numeric_cols[0])
+            return 'bar', {'x_col': categorical_cols[0], 'y_col': numeric_cols[0], **options}
         elif len(numeric_cols) == 1:
-            return self._create_histogram(data, numeric_cols[0])
-        else:
-            return {'error': 'Unable to determine appropriate chart type'}
+            return 'histogram', {'col': numeric_cols[0], **options}
+        return None, options
+    
+    def _validate_options(self, data: pd.DataFrame, chart_type: str, options: Dict[str, Any]) -> Optional[str]:
+        unsupported = sorted(set(options) - set(self.chart_options[chart_type]))
+        if unsupported:
+            return f"Unsupported option(s) for {chart_type} chart: {', '.join(unsupported)}"
+        if chart_type == 'scatter' and options.get('x_col') is not None and options.get('x_col') == options.get('y_col'):
+            return 'x_col and y_col must be different columns for a scatter chart'
+        if 'mode' in options and options['mode'] not in ['hexbin', 'bin']:
+            return "mode must be 'hexbin' or 'bin'"
+        if 'bins' in options and (not isinstance(options['bins'], int) or isinstance(options['bins'], bool) or options['bins'] < 1):
+            return 'bins must be a positive integer'
+        for option in ['x_col', 'y_col', 'col']:
+            if options.get(option) is not None and options[option] not in data.columns:
+                return f"Unknown column for {option}: {options[option]}"
+        return None
+    
+    def _to_spec(self, fig) -> Dict[str, Any]:
+        # plotly.js is loaded once by the page; the template is left to plotly.js defaults to keep specs small
+        spec = json.loads(fig.to_json())
+        spec['layout'].pop('template', None)
+        return spec
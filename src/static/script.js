@@ -402,6 +402,23 @@ async function generateInsights() {
     }
 }
 
+async function renderChart(fileId, containerId, chartType = 'auto', options = {}) {
+    // Charts come back as compact JSON specs; plotly.js is loaded once by the page
+    const response = await fetch(`${API_BASE_URL}/chart/${fileId}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ chart_type: chartType, ...options })
+    });
+
+    const result = await response.json();
+    if (!response.ok) {
+        throw new Error(result.error || `HTTP error! status: ${response.status}`);
+    }
+
+    Plotly.react(containerId, result.chart_spec.data, result.chart_spec.layout, { responsive: true });
+    return result;
+}
+
 function displayInsights(result) {
     const insightsResults = document.getElementById('insightsResults');
 
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Tuple
+
+class Downsampler:
+    def __init__(self, max_points: int = 2000):
+        self.max_points = max_points
+    
+    def to_numeric(self, values: pd.Series) -> np.ndarray:
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values.astype('int64').to_numpy(dtype=float)
+        return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    
+    def lttb(self, x: np.ndarray, y: np.ndarray, threshold: int = None) -> np.ndarray:
+        # Largest-Triangle-Three-Buckets: returns the indices of the points that keep the visual shape
+        threshold = threshold or self.max_points
+        n = len(x)
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+        
+        edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+        selected = np.empty(threshold, dtype=int)
+        selected[0], selected[-1] = 0, n - 1
+        
+        prev = 0
+        for i in range(threshold - 2):
+            start, end = edges[i], edges[i + 1]
+            next_end = edges[i + 2] if i + 2 < len(edges) else n
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+            
+            area = np.abs(
+                (x[prev] - avg_x) * (y[start:end] - y[prev])
+                - (x[prev] - x[start:end]) * (avg_y - y[prev])
+            )
+            prev = start + int(np.argmax(area))
+            selected[i + 1] = prev
+        
+        return selected
+    
+    def bin_2d(self, x: np.ndarray, y: np.ndarray, bins: int = None) -> Dict[str, Any]:
+        # A square grid with at most max_points cells
+        bins = bins or max(int(np.sqrt(self.max_points)), 1)
+        counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+        return {
+            'x': (x_edges[:-1] + x_edges[1:]) / 2,
+            'y': (y_edges[:-1] + y_edges[1:]) / 2,
+            # Heatmap rows follow y, columns follow x
+            'z': np.where(counts.T > 0, counts.T, np.nan)
+        }
+    
+    def hexbin(self, x: np.ndarray, y: np.ndarray, gridsize: int = None) -> Dict[str, np.ndarray]:
+        # Same two offset lattices as matplotlib's hexbin; each point goes to the nearer centre.
+        # The two lattices hold about 2 * gridsize^2 / sqrt(3) centres plus an edge row and column
+        gridsize = gridsize or max(int(np.sqrt(self.max_points * np.sqrt(3) / 2)) - 1, 1)
+        x_min, x_max = x.min(), x.max()
+        y_min, y_max = y.min(), y.max()
+        sx = (x_max - x_min) / gridsize or 1.0
+        sy = (y_max - y_min) / gridsize or 1.0
+        ix = (x - x_min) / sx
+        iy = (y - y_min) / sy / np.sqrt(3)
+        
+        ix1, iy1 = np.round(ix), np.round(iy)
+        ix2, iy2 = np.floor(ix) + 0.5, np.floor(iy) + 0.5
+        d1 = (ix - ix1) ** 2 + 3 * (iy - iy1) ** 2
+        d2 = (ix - ix2) ** 2 + 3 * (iy - iy2) ** 2
+        use_first = d1 <= d2
+        cx = np.where(use_first, ix1, ix2)
+        cy = np.where(use_first, iy1, iy2)
+        
+        # Centres sit on a half-integer grid, so doubling them gives exact integer keys
+        cols = (cx * 2).astype(np.int64)
+        rows = (cy * 2).astype(np.int64)
+        width = int(cols.max()) + 1
+        keys, counts = np.unique(rows * width + cols, return_counts=True)
+        return {
+            'x': (keys % width) / 2 * sx + x_min,
+            'y': (keys // width) / 2 * sy * np.sqrt(3) + y_min,
+            'count': counts
+        }
+    
+    def histogram_bins(self, values: np.ndarray, bins: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        counts, edges = np.histogram(values, bins=bins)
+        return counts, edges
@@ -0,0 +1,178 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGE_METRIC = 'rag_stage_duration_seconds'
+
+_current_trace = contextvars.ContextVar('rag_request_trace', default=None)
+
+class RequestTrace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, list] = {}
+    
+    def add(self, stage: str, seconds: float):
+        totals = self.stages.setdefault(stage, [0.0, 0])
+        totals[0] += seconds
+        totals[1] += 1
+    
+    def breakdown(self) -> Dict[str, Any]:
+        # Stages nest (e.g. rag.retrieve contains vector_db.similarity), so they do not add up to the total
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'stages': {
+                stage: {'ms': round(seconds * 1000, 3), 'calls': calls}
+                for stage, (seconds, calls) in self.stages.items()
+            }
+        }
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._gauges: Dict[str, Dict[tuple, float]] = {}
+        self._gauge_callbacks: Dict[str, Callable[[], float]] = {}
+        self._histograms: Dict[str, Dict[tuple, Histogram]] = {}
+        self.describe(STAGE_METRIC, 'histogram', 'Latency of instrumented pipeline stages')
+    
+    def describe(self, name: str, kind: str, help_text: str):
+        self._help[name] = (kind, help_text)
+    
+    def increment(self, name: str, value: float = 1, **labels):
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._label_key(labels)] = value
+    
+    def add_gauge(self, name: str, delta: float, **labels):
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + delta
+    
+    def register_gauge(self, name: str, callback: Callable[[], float], help_text: str = ''):
+        # Evaluated at scrape time, for values owned by other objects such as index size
+        self._gauge_callbacks[name] = callback
+        self.describe(name, 'gauge', help_text)
+    
+    def observe(self, name: str, value: float, **labels):
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+    
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(STAGE_METRIC, elapsed, stage=stage)
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.add(stage, elapsed)
+    
+    def start_trace(self) -> contextvars.Token:
+        return _current_trace.set(RequestTrace())
+    
+    def current_trace(self) -> Optional[RequestTrace]:
+        return _current_trace.get()
+    
+    def end_trace(self, token: contextvars.Token):
+        _current_trace.reset(token)
+    
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                dict(key)['stage']: {'count': hist.count, 'sum_seconds': hist.sum}
+                for key, hist in self._histograms.get(STAGE_METRIC, {}).items()
+            }
+    
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            histograms = {
+                name: {key: (list(h.counts), h.sum, h.count, h.buckets) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+        
+        for name, callback in self._gauge_callbacks.items():
+            try:
+                gauges.setdefault(name, {})[()] = float(callback())
+            except Exception:
+                continue
+        
+        for kind, families in [('counter', counters), ('gauge', gauges)]:
+            for name in sorted(families):
+                self._render_header(lines, name, kind)
+                for key, value in sorted(families[name].items()):
+                    lines.append(f'{name}{self._format_labels(key)} {self._format_value(value)}')
+        
+        for name in sorted(histograms):
+            self._render_header(lines, name, 'histogram')
+            for key, (counts, total, count, buckets) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{self._format_labels(key, le=repr(bound))} {cumulative}')
+                lines.append(f'{name}_bucket{self._format_labels(key, le="+Inf")} {count}')
+                lines.append(f'{name}_sum{self._format_labels(key)} {self._format_value(total)}')
+                lines.append(f'{name}_count{self._format_labels(key)} {count}')
+        
+        return '\n'.join(lines) + '\n'
+    
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+    
+    def _render_header(self, lines: list, name: str, kind: str):
+        _, help_text = self._help.get(name, (kind, ''))
+        if help_text:
+            lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+    
+    def _label_key(self, labels: Dict[str, Any]) -> tuple:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+    
+    def _format_labels(self, key: tuple, **extra) -> str:
+        pairs = list(key) + list(extra.items())
+        if not pairs:
+            return ''
+        escaped = [
+            f'{label}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for label, value in pairs
+        ]
+        return '{' + ','.join(escaped) + '}'
+    
+    def _format_value(self, value: float) -> str:
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+metrics = MetricsRegistry()
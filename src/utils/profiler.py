@@ -0,0 +1,87 @@
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict
+
+class SamplingProfiler:
+    def __init__(self, max_depth: int = 64, max_stacks: int = 10000):
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.interval = 0.01
+        self.samples = 0
+        self.started_at = None
+        self._stacks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self, interval: float = 0.01, reset: bool = True) -> bool:
+        # Check and spawn under the lock so concurrent starts cannot leave an unjoined sampler thread
+        with self._lock:
+            if self.running:
+                return False
+            if reset:
+                self._stacks.clear()
+                self.samples = 0
+            self.interval = max(interval, 0.001)
+            self.started_at = time.time()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        return True
+    
+    def stop(self) -> bool:
+        # Join the thread that was signalled, not one a concurrent start may have spawned since
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return False
+            self._stop.set()
+        thread.join()
+        return True
+    
+    def snapshot(self, limit: int = 50) -> Dict[str, Any]:
+        with self._lock:
+            stacks = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)
+            samples = self.samples
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'started_at': self.started_at,
+            'samples': samples,
+            'stacks': [{'stack': stack, 'count': count} for stack, count in stacks[:limit]]
+        }
+    
+    def folded(self) -> str:
+        with self._lock:
+            return '\n'.join(f'{stack} {count}' for stack, count in self._stacks.items()) + '\n'
+    
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    stack = self._fold(frame)
+                    if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                        self._stacks[stack] = self._stacks.get(stack, 0) + 1
+                    else:
+                        self._stacks['[truncated]'] = self._stacks.get('[truncated]', 0) + 1
+                self.samples += 1
+    
+    def _fold(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({os.path.basename(code.co_filename)})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+profiler = SamplingProfiler()
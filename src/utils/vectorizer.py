@@ -3,6 +3,7 @@ from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any
 import pickle
 import os
+from src.utils.metrics import metrics
 
 class VectorDatabase:
     def __init__(self, persist_directory: str = "./vector_db"):
@@ -16,34 +17,60 @@ class VectorDatabase:
         self.metadatas = []
         self.ids = []
         self.embeddings = []
+        # file_id -> metadata of its first chunk, so lookups don't scan every chunk
+        self.file_metadata = {}
         
         # Try to load existing data
         self._load_data()
     
-    def add_documents(self, texts: List[str], metadatas: List[Dict], ids: List[str]):
-        embeddings = self.encoder.encode(texts, convert_to_numpy=True)
+    def add_documents(self, texts: List[str], metadatas: List[Dict], ids: List[str], persist: bool = True):
+        with metrics.timer('vector_db.encode'):
+            embeddings = self.encoder.encode(texts, convert_to_numpy=True)
+        metrics.increment('rag_vector_db_documents_added_total', len(texts))
         
         self.documents.extend(texts)
         self.metadatas.extend(metadatas)
         self.ids.extend(ids)
         self.embeddings.extend(embeddings)
+        self._index_metadata(metadatas)
         
+        if persist:
+            self._save_data()
+    
+    def save(self):
         self._save_data()
     
+    def checkpoint(self) -> int:
+        return len(self.documents)
+    
+    def rollback(self, checkpoint: int):
+        for metadata in self.metadatas[checkpoint:]:
+            file_id = metadata.get('file_id')
+            if self.file_metadata.get(file_id) is metadata:
+                del self.file_metadata[file_id]
+        del self.documents[checkpoint:]
+        del self.metadatas[checkpoint:]
+        del self.ids[checkpoint:]
+        del self.embeddings[checkpoint:]
+    
     def search(self, query: str, n_results: int = 5) -> Dict[str, Any]:
         if not self.embeddings:
             return {'documents': [], 'metadatas': [], 'distances': []}
         
-        query_embedding = self.encoder.encode([query], convert_to_numpy=True)
+        with metrics.timer('vector_db.encode_query'):
+            query_embedding = self.encoder.encode([query], convert_to_numpy=True)
         
         # Calculate cosine similarities
-        similarities = []
-        for emb in self.embeddings:
-            sim = np.dot(query_embedding[0], emb) / (np.linalg.norm(query_embedding[0]) * np.linalg.norm(emb))
-            similarities.append(sim)
+        with metrics.timer('vector_db.similarity'):
+            similarities = []
+            for emb in self.embeddings:
+                sim = np.dot(query_embedding[0], emb) / (np.linalg.norm(query_embedding[0]) * np.linalg.norm(emb))
+                similarities.append(sim)
         
         # Get top results
-        top_indices = np.argsort(similarities)[-n_results:][::-1]
+        with metrics.timer('vector_db.rank'):
+            top_indices = np.argsort(similarities)[-n_results:][::-1]
+        metrics.increment('rag_vector_db_searches_total')
         
         results = {
             'documents': [self.documents[i] for i in top_indices],
@@ -53,6 +80,9 @@ class VectorDatabase:
         
         return results
     
+    def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
+        return self.file_metadata.get(file_id, {})
+    
     def get_collection_stats(self) -> Dict[str, int]:
         return {"document_count": len(self.documents)}
     
@@ -64,20 +94,27 @@ class VectorDatabase:
             'embeddings': self.embeddings
         }
         
-        with open(os.path.join(self.persist_directory, 'data.pkl'), 'wb') as f:
-            pickle.dump(data, f)
+        with metrics.timer('vector_db.save'):
+            with open(os.path.join(self.persist_directory, 'data.pkl'), 'wb') as f:
+                pickle.dump(data, f)
     
     def _load_data(self):
         data_path = os.path.join(self.persist_directory, 'data.pkl')
         if os.path.exists(data_path):
             try:
-                with open(data_path, 'rb') as f:
-                    data = pickle.load(f)
+                with metrics.timer('vector_db.load'):
+                    with open(data_path, 'rb') as f:
+                        data = pickle.load(f)
                 
                 self.documents = data.get('documents', [])
                 self.metadatas = data.get('metadatas', [])
                 self.ids = data.get('ids', [])
                 self.embeddings = data.get('embeddings', [])
+                self._index_metadata(self.metadatas)
             except:
                 # If loading fails, start fresh
-                pass
\ No newline at end of file
+                pass
+    
+    def _index_metadata(self, metadatas: List[Dict]):
+        for metadata in metadatas:
+            self.file_metadata.setdefault(metadata.get('file_id'), metadata)
\ No newline at end of file
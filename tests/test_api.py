@@ -0,0 +1,119 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+import src.utils.vectorizer as vectorizer
+
+class FakeEncoder:
+    def encode(self, texts, convert_to_numpy=True):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    # The routes module builds its pipelines at import time, so the encoder is replaced and the working
+    # directory moved before it is imported
+    patch = pytest.MonkeyPatch()
+    patch.setattr(vectorizer, 'SentenceTransformer', lambda *args, **kwargs: FakeEncoder())
+    patch.chdir(tmp_path_factory.mktemp('app'))
+    from src.app import create_app
+    from src.api import routes
+    yield create_app(), routes
+    patch.undo()
+
+@pytest.fixture
+def client(app):
+    return app[0].test_client()
+
+@pytest.fixture
+def register_file(app):
+    def register(file_id, path):
+        app[1].ingestion.rag_model.vector_db.add_documents(['chunk'], [{'file_id': file_id, 'file_path': str(path)}], [f'{file_id}_0'], persist=False)
+        return file_id
+    return register
+
+def test_chart_returns_spec(client, register_file, tmp_path):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'a': range(20), 'b': range(20, 40)}).to_csv(path, index=False)
+    file_id = register_file('chart_csv', path)
+    
+    response = client.post(f'/api/chart/{file_id}', json={'chart_type': 'line', 'x_col': 'a', 'y_col': 'b'})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['chart_type'] == 'line'
+    assert body['chart_spec']['data'][0]['type'] == 'scatter'
+
+def test_chart_validation_errors_are_400(client, register_file, tmp_path):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'a': range(5), 'b': range(5)}).to_csv(path, index=False)
+    file_id = register_file('chart_errors', path)
+    
+    assert client.post(f'/api/chart/{file_id}', json=[1]).status_code == 400
+    assert client.post(f'/api/chart/{file_id}', json={'sheet': 5}).status_code == 400
+    assert client.post(f'/api/chart/{file_id}', json={'chart_type': 'line', 'mode': 'bin'}).status_code == 400
+    assert client.post(f'/api/chart/{file_id}', json={'chart_type': 'pie'}).status_code == 400
+    assert client.post('/api/chart/missing', json={}).status_code == 404
+
+def test_chart_of_non_tabular_file_is_400(client, register_file, tmp_path):
+    path = tmp_path / 'notes.pdf'
+    path.write_bytes(b'%PDF-1.4')
+    response = client.post(f"/api/chart/{register_file('chart_pdf', path)}", json={})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'No tabular data for file format: pdf'
+
+def test_chart_of_database_uses_first_table(client, register_file, tmp_path):
+    path = tmp_path / 'plant.db'
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE t (kiln TEXT, output REAL)')
+        conn.executemany('INSERT INTO t VALUES (?, ?)', [('k1', 1.0), ('k2', 2.5)])
+    file_id = register_file('chart_db', path)
+    
+    response = client.post(f'/api/chart/{file_id}', json={'chart_type': 'bar'})
+    assert response.status_code == 200
+    assert response.get_json()['chart_spec']['layout']['xaxis']['title']['text'] == 'kiln'
+    assert client.post(f'/api/chart/{file_id}', json={'sheet': 'x; DROP TABLE t'}).status_code == 400
+
+def test_timings_are_added_to_body_and_header(client, register_file, tmp_path):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'a': range(5), 'b': range(5)}).to_csv(path, index=False)
+    file_id = register_file('timed', path)
+    
+    plain = client.post(f'/api/chart/{file_id}', json={'chart_type': 'bar'})
+    assert 'timings' not in plain.get_json()
+    assert 'Server-Timing' not in plain.headers
+    
+    timed = client.post(f'/api/chart/{file_id}?timings=1', json={'chart_type': 'line'})
+    stages = timed.get_json()['timings']['stages']
+    assert {'chart.load', 'chart.render'} <= set(stages)
+    assert 'chart.load;dur=' in timed.headers['Server-Timing']
+    
+    by_header = client.post(f'/api/chart/{file_id}', json={'chart_type': 'line'}, headers={'X-Request-Timing': '1'})
+    assert 'timings' in by_header.get_json()
+
+def test_in_flight_gauge_returns_to_zero_after_error(app, client, monkeypatch):
+    from src.utils.metrics import metrics
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError('boom')
+    
+    monkeypatch.setattr(app[1].ingestion.rag_model.vector_db, 'get_file_metadata', fail)
+    assert client.post('/api/chart/any', json={}).status_code == 500
+    text = metrics.render_prometheus()
+    assert 'rag_http_requests_in_flight 0\n' in text
+    assert 'rag_http_requests_total{endpoint="api.get_chart",status="500"}' in text
+
+def test_runtime_profiling_is_opt_in(app, client, monkeypatch):
+    monkeypatch.setattr(app[1].config, 'PROFILER_ALLOW_RUNTIME', False)
+    assert client.post('/api/profiler', json={'action': 'start'}).status_code == 403
+    assert not app[1].profiler.running
+
+def test_profiler_rejects_bad_input(app, client, monkeypatch):
+    monkeypatch.setattr(app[1].config, 'PROFILER_ALLOW_RUNTIME', True)
+    for body in [[1], {'action': 'pause'}, {'action': 'start', 'interval': 'abc'}, {'action': 'start', 'interval': 0}, {'action': 'start', 'interval': True}]:
+        assert client.post('/api/profiler', json=body).status_code == 400
+    for limit in ['abc', '-1', '']:
+        assert client.get(f'/api/profiler?limit={limit}').status_code == 400
+    assert not app[1].profiler.running
+    
+    assert client.post('/api/profiler', json={'action': 'start', 'interval': 0.005}).status_code == 200
+    assert client.post('/api/profiler', json={'action': 'stop'}).get_json()['changed'] is True
+    assert client.get('/api/profiler?limit=5').status_code == 200
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from src.utils.downsampling import Downsampler
+
+@pytest.fixture
+def downsampler():
+    return Downsampler(max_points=100)
+
+def test_lttb_keeps_endpoints_and_threshold_points(downsampler):
+    x = np.arange(10000, dtype=float)
+    y = np.sin(x / 50)
+    indices = downsampler.lttb(x, y)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 9999
+    assert np.all(np.diff(indices) > 0)
+
+def test_lttb_keeps_short_series(downsampler):
+    assert downsampler.lttb(np.arange(50.0), np.arange(50.0)).tolist() == list(range(50))
+
+def test_lttb_keeps_spike(downsampler):
+    y = np.zeros(10000)
+    y[4321] = 100
+    assert 4321 in downsampler.lttb(np.arange(10000, dtype=float), y)
+
+def test_hexbin_counts_every_point(downsampler):
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=20000), rng.normal(size=20000)
+    hexes = downsampler.hexbin(x, y)
+    assert hexes['count'].sum() == 20000
+    assert len(hexes['count']) <= 100
+    assert len(hexes['x']) == len(hexes['y']) == len(hexes['count'])
+
+def test_hexbin_constant_input(downsampler):
+    hexes = downsampler.hexbin(np.ones(10), np.ones(10))
+    assert hexes['count'].tolist() == [10]
+
+def test_bin_2d_grid_follows_max_points(downsampler):
+    rng = np.random.default_rng(0)
+    binned = downsampler.bin_2d(rng.random(5000), rng.random(5000))
+    assert binned['z'].shape == (10, 10)
+    assert np.nansum(binned['z']) == 5000
+
+def test_histogram_bins(downsampler):
+    counts, edges = downsampler.histogram_bins(np.arange(100, dtype=float), bins=10)
+    assert counts.tolist() == [10] * 10
+    assert edges[0] == 0 and edges[-1] == 99
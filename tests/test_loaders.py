@@ -0,0 +1,137 @@
+import json
+import sqlite3
+import pandas as pd
+import pytest
+from src.data.loaders import DataLoader
+
+@pytest.fixture
+def loader():
+    return DataLoader()
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding='utf-8')
+    return str(path)
+
+def collect(batches):
+    frames = list(batches)
+    return sum(len(frame) for frame in frames), frames
+
+def test_json_top_level_array(loader, tmp_path):
+    path = write(tmp_path, 'rows.json', [{'id': i, 'v': {'x': i}} for i in range(12)])
+    rows, frames = collect(loader.iter_json_records(path, batch_size=5))
+    assert rows == 12
+    assert [len(frame) for frame in frames] == [5, 5, 2]
+    assert list(frames[0].columns) == ['id', 'v.x']
+
+def test_json_picks_most_frequent_array_over_first(loader, tmp_path):
+    path = write(tmp_path, 'export.json', {
+        'export': {'meta': {'tags': [{'a': 1}]}, 'rows': [{'id': i} for i in range(7)]}
+    })
+    rows, frames = collect(loader.iter_json_records(path))
+    assert rows == 7
+    assert list(frames[0]['id']) == list(range(7))
+
+def test_json_steps_through_wrapper_arrays(loader, tmp_path):
+    path = write(tmp_path, 'batches.json', {
+        'meta': {'tags': [{'t': 1}, {'t': 2}]},
+        'data': {'batches': [{'rows': [{'id': i} for i in range(1000)]}]}
+    })
+    rows, frames = collect(loader.iter_json_records(path))
+    assert rows == 1000
+    assert list(frames[0].columns) == ['id']
+
+def test_json_steps_through_single_item_array(loader, tmp_path):
+    path = write(tmp_path, 'wrapped.json', [{'rows': [{'id': i} for i in range(1000)]}])
+    rows, frames = collect(loader.iter_json_records(path, batch_size=400))
+    assert rows == 1000
+    assert [len(frame) for frame in frames] == [400, 400, 200]
+
+def test_json_scalar_list_stays_in_single_record(loader, tmp_path):
+    path = write(tmp_path, 'plant.json', {'name': 'kiln', 'capacity': 5, 'tags': ['a', 'b', 'c']})
+    rows, frames = collect(loader.iter_json_records(path))
+    assert rows == 1
+    assert frames[0].loc[0, 'name'] == 'kiln'
+    assert json.loads(frames[0].loc[0, 'tags']) == ['a', 'b', 'c']
+
+@pytest.mark.parametrize('orient, columns', [('split', ['a', 'b']), ('values', ['0', '1'])])
+def test_json_row_arrays_are_records(loader, tmp_path, orient, columns):
+    frame = pd.DataFrame({'a': [1, 2, 3, 4], 'b': [5, 6, 7, 8]})
+    path = write(tmp_path, f'{orient}.json', frame.to_json(orient=orient))
+    result = pd.concat(loader.iter_json_records(path), ignore_index=True)
+    assert result.shape == (4, 2)
+    assert list(result.columns) == columns
+    assert result.iloc[:, 1].tolist() == [5, 6, 7, 8]
+
+def test_json_ambiguous_arrays_are_rejected(loader, tmp_path):
+    path = write(tmp_path, 'two.json', {'customers': [{'id': i} for i in range(60)], 'orders': [{'id': i} for i in range(100)]})
+    with pytest.raises(ValueError, match='Ambiguous'):
+        list(loader.iter_json_records(path))
+
+def test_json_nested_lists_stay_inside_records(loader, tmp_path):
+    path = write(tmp_path, 'orders.json', {
+        'orders': [{'id': i, 'lines': [{'sku': 'a'}, {'sku': 'b'}, {'sku': 'c'}]} for i in range(3)]
+    })
+    rows, frames = collect(loader.iter_json_records(path))
+    assert rows == 3
+    assert 'lines' in frames[0].columns
+
+def test_json_empty_array_is_rejected(loader, tmp_path):
+    path = write(tmp_path, 'empty.json', [])
+    with pytest.raises(ValueError):
+        list(loader.iter_json_records(path))
+
+def test_json_single_object_is_one_record(loader, tmp_path):
+    path = write(tmp_path, 'single.json', {'a': 1, 'b': {'c': 2}})
+    rows, frames = collect(loader.iter_json_records(path))
+    assert rows == 1
+    assert frames[0].loc[0, 'b.c'] == 2
+
+def test_xml_picks_most_frequent_repeated_path(loader, tmp_path):
+    records = ''.join(f'<rec id="{i}"><qty>{i}</qty></rec>' for i in range(5))
+    path = write(tmp_path, 'export.xml', f'<root><header><f>1</f><f>2</f></header><records>{records}</records></root>')
+    rows, frames = collect(loader.iter_xml_records(path, batch_size=2))
+    assert rows == 5
+    assert list(frames[0]['@id']) == ['0', '1']
+
+def test_xml_records_inside_repeated_batches(loader, tmp_path):
+    batch = ''.join(f'<rec><id>{i}</id></rec>' for i in range(500))
+    path = write(tmp_path, 'batches.xml', f'<root><batch>{batch}</batch><batch>{batch}</batch></root>')
+    rows, frames = collect(loader.iter_xml_records(path))
+    assert rows == 1000
+    assert list(frames[0].columns) == ['id']
+
+def test_xml_long_lookup_section_does_not_decide(loader, tmp_path):
+    lookup = ''.join(f'<code k="{i}"/>' for i in range(6000))
+    records = ''.join(f'<rec><id>{i}</id><qty>{i}</qty></rec>' for i in range(20000))
+    path = write(tmp_path, 'lookup.xml', f'<root><lookup>{lookup}</lookup><records>{records}</records></root>')
+    rows, frames = collect(loader.iter_xml_records(path))
+    assert rows == 20000
+    assert list(frames[0].columns) == ['id', 'qty']
+
+def test_xml_repeated_children_stay_inside_records(loader, tmp_path):
+    orders = ''.join(f'<order><item>a</item><item>b</item><item>c</item><qty>{i}</qty></order>' for i in range(3))
+    path = write(tmp_path, 'orders.xml', f'<orders>{orders}</orders>')
+    rows, frames = collect(loader.iter_xml_records(path))
+    assert rows == 3
+    assert json.loads(frames[0].loc[0, 'item']) == ['a', 'b', 'c']
+
+def test_xml_to_dict_keeps_repeated_siblings(loader, tmp_path):
+    path = write(tmp_path, 'doc.xml', '<root><tag>a</tag><tag>b</tag><other>c</other></root>')
+    assert loader.load_xml(path) == {'tag': ['a', 'b'], 'other': 'c'}
+
+def test_load_database_rejects_unknown_table(loader, tmp_path):
+    path = str(tmp_path / 'data.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE "my table" (v INTEGER)')
+        conn.execute('INSERT INTO "my table" VALUES (1)')
+    assert loader.load_database(path, 'my table')['v'].tolist() == [1]
+    with pytest.raises(ValueError, match='Unknown table'):
+        loader.load_database(path, 'x; DROP TABLE y')
+
+def test_load_table_defaults_to_first_database_table(loader, tmp_path):
+    path = str(tmp_path / 'data.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE t (v INTEGER)')
+        conn.execute('INSERT INTO t VALUES (7)')
+    assert loader.load_table(path)['v'].tolist() == [7]
@@ -0,0 +1,54 @@
+import pytest
+from src.utils.metrics import MetricsRegistry, STAGE_METRIC
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def series(text, name):
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+def test_histogram_buckets_are_cumulative(registry):
+    for value in [0.002, 0.002, 0.3, 100.0]:
+        registry.observe('latency', value, stage='x')
+    lines = series(registry.render_prometheus(), 'latency')
+    buckets = [line for line in lines if line.startswith('latency_bucket')]
+    counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+    
+    assert counts == sorted(counts)
+    assert 'latency_bucket{stage="x",le="0.005"} 2' in lines
+    assert 'latency_bucket{stage="x",le="0.5"} 3' in lines
+    assert buckets[-1] == 'latency_bucket{stage="x",le="+Inf"} 4'
+    assert 'latency_count{stage="x"} 4' in lines
+    assert 'latency_sum{stage="x"} 100.304' in lines
+
+def test_labels_are_escaped(registry):
+    registry.increment('requests_total', endpoint='a"b\\c\nd')
+    assert 'requests_total{endpoint="a\\"b\\\\c\\nd"} 1' in registry.render_prometheus()
+
+def test_headers_and_gauge_callbacks(registry):
+    registry.describe('requests_total', 'counter', 'Requests served')
+    registry.increment('requests_total')
+    registry.register_gauge('queue_depth', lambda: 3, 'Items waiting')
+    registry.register_gauge('broken', lambda: 1 / 0)
+    text = registry.render_prometheus()
+    
+    assert '# HELP requests_total Requests served\n# TYPE requests_total counter\nrequests_total 1\n' in text
+    assert '# TYPE queue_depth gauge\nqueue_depth 3.0\n' in text
+    assert 'broken' not in text
+
+def test_timer_records_stage_and_trace(registry):
+    token = registry.start_trace()
+    try:
+        with registry.timer('load'):
+            pass
+        with registry.timer('load'):
+            pass
+        breakdown = registry.current_trace().breakdown()
+    finally:
+        registry.end_trace(token)
+    
+    assert breakdown['stages']['load']['calls'] == 2
+    assert registry.stage_summary()['load']['count'] == 2
+    assert registry.current_trace() is None
+    assert f'{STAGE_METRIC}_count{{stage="load"}} 2' in registry.render_prometheus()
@@ -0,0 +1,43 @@
+import threading
+import time
+from src.utils.profiler import SamplingProfiler
+
+def sampler_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'sampling-profiler']
+
+def test_concurrent_starts_spawn_one_sampler():
+    profiler = SamplingProfiler()
+    barrier = threading.Barrier(8)
+    results = []
+    
+    def start():
+        barrier.wait()
+        results.append(profiler.start(0.001))
+    
+    starters = [threading.Thread(target=start) for _ in range(8)]
+    for thread in starters:
+        thread.start()
+    for thread in starters:
+        thread.join()
+    
+    try:
+        assert results.count(True) == 1
+        assert len(sampler_threads()) == 1
+    finally:
+        assert profiler.stop()
+    assert not sampler_threads()
+    assert not profiler.stop()
+
+def test_samples_are_folded_stacks():
+    profiler = SamplingProfiler()
+    profiler.start(0.001)
+    deadline = time.time() + 2
+    while profiler.samples < 5 and time.time() < deadline:
+        time.sleep(0.01)
+    profiler.stop()
+    
+    snapshot = profiler.snapshot(limit=3)
+    assert snapshot['samples'] >= 5
+    assert not snapshot['running']
+    assert len(snapshot['stacks']) <= 3
+    assert 'test_samples_are_folded_stacks (test_profiler.py)' in profiler.folded()
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+import src.utils.vectorizer as vectorizer
+from src.models.rag_model import RAGModel
+
+class FakeEncoder:
+    def encode(self, texts, convert_to_numpy=True):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+@pytest.fixture
+def rag_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(vectorizer, 'SentenceTransformer', lambda *args, **kwargs: FakeEncoder())
+    return RAGModel(str(tmp_path / 'vector_db'))
+
+def test_ingest_stream_rolls_back_partial_file(rag_model):
+    rag_model.vector_db.add_documents(['existing'], [{'file_id': 'old'}], ['old_0'])
+    
+    def batches():
+        yield 'first batch'
+        raise ValueError('truncated file')
+    
+    with pytest.raises(ValueError):
+        rag_model.ingest_stream(batches(), {'file_id': 'new'})
+    
+    db = rag_model.vector_db
+    assert db.documents == ['existing']
+    assert len(db.metadatas) == len(db.ids) == len(db.embeddings) == 1
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.pipelines.visualization import VisualizationPipeline
+
+@pytest.fixture
+def pipeline():
+    return VisualizationPipeline()
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'a': range(50), 'b': range(50, 100)}).to_csv(path, index=False)
+    return str(path)
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'a': range(10), 'b': range(10, 20), 'c': list('xyxyxyxyxy')})
+
+def test_auto_chart_keeps_caller_options(pipeline, frame):
+    chart = pipeline.generate_visualization(frame, 'auto', x_col='b', y_col='a', mode='bin')
+    assert chart['chart_type'] == 'scatter'
+    assert chart['chart_spec']['layout']['xaxis']['title']['text'] == 'b'
+
+def test_unsupported_option_is_a_validation_error(pipeline, frame):
+    chart = pipeline.generate_visualization(frame, 'line', mode='bin')
+    assert chart == {'error': 'Unsupported option(s) for line chart: mode', 'chart_spec': None}
+
+def test_unknown_column_is_rejected(pipeline, frame):
+    chart = pipeline.generate_visualization(frame, 'bar', x_col='missing')
+    assert chart['error'] == 'Unknown column for x_col: missing'
+
+def test_scatter_rejects_same_column_twice(pipeline, frame):
+    chart = pipeline.generate_visualization(frame, 'scatter', x_col='a', y_col='a')
+    assert chart['error'] == 'x_col and y_col must be different columns for a scatter chart'
+
+def test_scatter_default_column_differs_from_given_one(pipeline, frame):
+    chart = pipeline.generate_visualization(frame, 'scatter', x_col='b')
+    assert chart['chart_spec']['layout']['yaxis']['title']['text'] == 'a'
+
+def test_binned_scatter_stays_within_max_points(pipeline):
+    pipeline.downsampler.max_points = pipeline.config.CHART_MAX_POINTS = 400
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'x': rng.random(5000), 'y': rng.random(5000)})
+    for mode in ['bin', 'hexbin']:
+        chart = pipeline.generate_visualization(frame, 'scatter', mode=mode)
+        assert chart['points'] == 5000
+        assert 0 < chart['rendered_points'] <= 400
+
+def test_chart_cache_hits_and_evicts(pipeline, csv_file):
+    pipeline.config.CHART_CACHE_SIZE = 2
+    first = pipeline.get_chart('f1', csv_file, 'line', options={'x_col': 'a', 'y_col': 'b'})
+    assert pipeline.get_chart('f1', csv_file, 'line', options={'y_col': 'b', 'x_col': 'a'}) is first
+    
+    pipeline.get_chart('f1', csv_file, 'bar')
+    pipeline.get_chart('f1', csv_file, 'histogram')
+    assert pipeline.cache_size() == 2
+    assert pipeline.get_chart('f1', csv_file, 'line', options={'x_col': 'a', 'y_col': 'b'}) is not first
+
+def test_chart_errors_are_not_cached(pipeline, csv_file):
+    assert 'error' in pipeline.get_chart('f1', csv_file, 'line', options={'x_col': 'missing'})
+    assert pipeline.cache_size() == 0